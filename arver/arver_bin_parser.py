@@ -6,7 +6,6 @@ by certain AccurateRip-aware CD rippers (e.g. EAC or Whipper).
 import argparse
 import sys
 
-from arver.disc.database import AccurateRipParser
 from arver.version import version_string
 
 
@@ -23,15 +22,15 @@ def _parse_args():
 def main():
     args = _parse_args()
 
+    from arver.disc.database import AccurateRipParser  # pylint: disable=import-outside-toplevel
+
     dbar_parser = AccurateRipParser(args.dbar_file)
     disc = dbar_parser.parse()
     if disc is None:
         print('Failed to parse AccurateRip data file, exiting.')
         sys.exit(1)
 
-    print(disc.summary())
-    print()
-    print(disc)
+    print(f'{disc.summary()}\n\n{disc}')
 
 
 if __name__ == '__main__':
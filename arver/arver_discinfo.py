@@ -6,7 +6,7 @@ MusicBrainz disc ID. Download and display AccurateRip data of the CD.
 import argparse
 import sys
 
-from arver.disc.info import get_disc_info
+from arver.cache import disable_cache
 from arver.version import version_string
 
 
@@ -28,6 +28,10 @@ def _parse_args():
                             metavar='disc_id',
                             help='get disc TOC from MusicBrainz by disc ID query')
 
+    parser.add_argument('--no-cache',
+                        action='store_true',
+                        help='do not use cached MusicBrainz and AccurateRip data')
+
     parser.add_argument('-v', '--version', action='version', version=version_string())
 
     return parser.parse_args()
@@ -35,23 +39,25 @@ def _parse_args():
 
 def main():
     args = _parse_args()
+
+    if args.no_cache:
+        disable_cache()
+
+    from arver.disc.info import get_disc_info  # pylint: disable=import-outside-toplevel
     disc = get_disc_info(args.drive, args.disc_id)
 
     if disc is None:
         print('Failed to get disc info, exiting.')
         sys.exit(1)
 
-    print(disc)
-    print()
+    print(f'{disc}\n')
 
     disc.fetch_accuraterip_data()
     if disc.accuraterip_data is None:
         print('Failed to download AccurateRip data, exiting.')
         sys.exit(2)
 
-    print(disc.accuraterip_data.summary())
-    print()
-    print(disc.accuraterip_data)
+    print(f'{disc.accuraterip_data.summary()}\n\n{disc.accuraterip_data}')
 
 
 if __name__ == '__main__':
@@ -3,31 +3,33 @@
 import argparse
 import sys
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
 
-from arver.disc.info import DiscInfo, get_disc_info
-from arver.rip.rip import Rip
+from arver.cache import disable_cache
 from arver.version import version_string
 
+_DESCRIPTION = textwrap.dedent("""\
+    Verify a set of audio tracks against checksums from AccurateRip database.
 
-def _parse_args():
-    parser = argparse.ArgumentParser(formatter_class=argparse.RawDescriptionHelpFormatter,
-                                     description=textwrap.dedent("""\
-        Verify a set of audio tracks against checksums from AccurateRip database.
+    Disc TOC necessary for AccurateRip lookup is obtained either from reading a
+    physical CD in drive (the default behavior, recommended if the disc contains
+    data tracks), from MusicBrainz disc ID query, or is estimated from the lengths
+    of provided audio tracks.
+
+    Calculation of AccurateRip checksums requires correct track sequence, so the
+    files must be specified in the correct order. Pregap track (HTOA) must not be
+    included.
 
-        Disc TOC necessary for AccurateRip lookup is obtained either from reading a
-        physical CD in drive (the default behavior, recommended if the disc contains
-        data tracks), from MusicBrainz disc ID query, or is estimated from the lengths
-        of provided audio tracks.
+    Disc ID calculation requires information about the length of track one pregap,
+    and of the data track, if they exist. This information cannot be derived from
+    a set of ripped files, so options for specifying lengths of these tracks are
+    available. They have no effect when the disc TOC is obtained from a physical
+    CD or from MusicBrainz disc ID query.""")
 
-        Calculation of AccurateRip checksums requires correct track sequence, so the
-        files must be specified in the correct order. Pregap track (HTOA) must not be
-        included.
 
-        Disc ID calculation requires information about the length of track one pregap,
-        and of the data track, if they exist. This information cannot be derived from
-        a set of ripped files, so options for specifying lengths of these tracks are
-        available. They have no effect when the disc TOC is obtained from a physical
-        CD or from MusicBrainz disc ID query."""))
+def _parse_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     description=_DESCRIPTION)
 
     parser.add_argument('rip_files',
                         nargs='+',
@@ -76,6 +78,10 @@ def _parse_args():
                         default=0,
                         help='length of Enhanced CD data track in CDDA frames')
 
+    parser.add_argument('--no-cache',
+                        action='store_true',
+                        help='do not use cached MusicBrainz and AccurateRip data')
+
     parser.add_argument('-v', '--version', action='version', version=version_string())
 
     return parser.parse_args()
@@ -84,6 +90,15 @@ def _parse_args():
 def main():
     args = _parse_args()
 
+    if args.no_cache:
+        disable_cache()
+
+    # Imported here so that --help and --version don't have to load pycdio,
+    # requests and the rest of disc and rip handling code.
+    # pylint: disable=import-outside-toplevel
+    from arver.disc.info import DiscInfo, get_disc_info
+    from arver.rip.rip import Rip
+
     rip = Rip(args.rip_files, args.exclude)
     if len(rip) == 0:
         print('No audio files were loaded. Did you specify correct files?')
@@ -98,18 +113,25 @@ def main():
         print('Failed to get disc info, exiting.')
         sys.exit(2)
 
-    print(disc)
-    print()
+    print(f'{disc}\n')
+
+    if not rip.matches_disc(disc, args.permissive):
+        # Verification will fail without using the checksums.
+        disc.fetch_accuraterip_data()
+    else:
+        # Calculate checksums of the rip while AccurateRip data is being
+        # downloaded in the background. Nothing else is printed until the
+        # download is finished, so its messages appear in the usual place.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            fetch = executor.submit(disc.fetch_accuraterip_data)
+            rip.calculate_checksums()
+            fetch.result()
 
-    disc.fetch_accuraterip_data()
     if disc.accuraterip_data is None:
-        print('Cannot verify, showing rip info instead.')
-        print()
-        print(rip.as_table())
+        print(f'Cannot verify, showing rip info instead.\n\n{rip.as_table()}')
         sys.exit(3)
 
-    print(disc.accuraterip_data.summary())
-    print()
+    print(f'{disc.accuraterip_data.summary()}\n')
 
     try:
         verdict = rip.verify(disc, args.permissive)
@@ -117,10 +139,7 @@ def main():
         print("Audio files don't match CD TOC, exiting.")
         sys.exit(4)
 
-    print()
-    print(verdict.as_table())
-    print()
-    print(verdict.summary())
+    print(f'\n{verdict.as_table()}\n\n{verdict.summary()}')
 
 
 if __name__ == '__main__':
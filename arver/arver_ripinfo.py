@@ -6,7 +6,6 @@ two types of AccurateRip checksums.
 import argparse
 import sys
 
-from arver.rip.rip import Rip
 from arver.version import version_string
 
 
@@ -37,6 +36,8 @@ def _parse_args():
 def main():
     args = _parse_args()
 
+    from arver.rip.rip import Rip  # pylint: disable=import-outside-toplevel
+
     rip = Rip(args.rip_files, args.exclude)
     if len(rip) == 0:
         print('No audio files were loaded. Did you specify correct files?')
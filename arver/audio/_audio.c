@@ -25,6 +25,7 @@
 #include <stdlib.h>
 #include <stdint.h>
 #include <endian.h>
+#include <fcntl.h>
 #include <sndfile.h>
 #include <zlib.h>
 
@@ -59,65 +60,116 @@ static int check_format(SF_INFO info)
     return 0;
 }
 
-static sample_t *load_audio_data(SNDFILE *file, SF_INFO info, size_t *size)
+// Running state of AccurateRip and CRC32 checksum calculation
+typedef struct checksums_t {
+    size_t sum_start;   // index of the first frame summed in AccurateRip checksums
+    size_t sum_end;     // index one past the last frame summed in AccurateRip checksums
+    uint32_t csum_hi;
+    uint32_t csum_lo;
+    uLong crc;
+} checksums_t;
+
+static checksums_t checksums_init(size_t nframes, unsigned track, unsigned total_tracks)
 {
-    size_t nsamples = info.frames * info.channels;
-    sample_t *data = calloc(nsamples, sizeof(sample_t));
+    const size_t skip_frames = 5 * 588; // 5 CDDA sectors * 588 audio frames per sector
 
-    if (data == NULL) {
-        return NULL;
+    uint32_t sum_from = 0;
+    if (track == 1) {
+        sum_from += skip_frames;
     }
 
-    if (sf_readf_short(file, (short*)data, info.frames) != info.frames) {
-        free(data);
-        return NULL;
+    uint32_t sum_to = nframes;
+    if (track == total_tracks) {
+        sum_to -= skip_frames;
     }
 
-    // libsndfile swaps byte order of samples to native CPU endianness.
-    // Ensure the samples are kept as little endian in memory, otherwise
-    // calculated checksums may not match AccurateRip database content.
-    // This is a no-op (LE to LE conversion) in most real-life use cases.
-    for (size_t i=0; i < nsamples; i++) {
-        data[i] = htole16(data[i]);
+    // Frame i is multiplied by i+1, and only multipliers within
+    // [sum_from, sum_to] contribute to the AccurateRip checksums.
+    return (checksums_t){
+        .sum_start = sum_from > 0 ? sum_from - 1 : 0,
+        .sum_end = sum_to < nframes ? sum_to : nframes,
+        .csum_hi = 0,
+        .csum_lo = 0,
+        .crc = crc32(0L, Z_NULL, 0),
+    };
+}
+
+static void checksums_update(checksums_t *state, const frame_t *frames, size_t first, size_t count)
+{
+    size_t start = first > state->sum_start ? first : state->sum_start;
+    size_t end = first + count < state->sum_end ? first + count : state->sum_end;
+
+    // Iterate over the summed frames only, so the loop body has no branches.
+    uint32_t csum_hi = state->csum_hi;
+    uint32_t csum_lo = state->csum_lo;
+    for (size_t i = start; i < end; i++) {
+        uint64_t product = (uint64_t)frames[i - first] * (uint64_t)(uint32_t)(i + 1);
+        csum_hi += (uint32_t)(product >> 32);
+        csum_lo += (uint32_t)(product);
     }
+    state->csum_hi = csum_hi;
+    state->csum_lo = csum_lo;
 
-    *size = nsamples;
-    return data;
+    state->crc = crc32(state->crc, (const Bytef*)frames, count * sizeof(frame_t));
 }
 
-static accuraterip_t accuraterip(const sample_t *data, size_t size, unsigned track, unsigned total_tracks)
+static accuraterip_t checksums_final(const checksums_t *state)
 {
-    const frame_t *frames = (const frame_t*)data;
-    const size_t nframes = size / 2;    // 2 samples per CDDA frame
-    const size_t skip_frames = 5 * 588; // 5 CDDA sectors * 588 audio frames per sector
+    return (accuraterip_t){.v1 = state->csum_lo, .v2 = state->csum_lo + state->csum_hi};
+}
 
-    uint32_t sum_from = 0;
-    if (track == 1) {
-        sum_from += skip_frames;
-    }
+// Read audio data in chunks of one second, and update the checksums as
+// each chunk is read. This way the whole track is never kept in memory,
+// and each chunk is still in CPU cache when the checksums are updated.
+static int process_audio_data(SNDFILE *file, SF_INFO info, checksums_t *state)
+{
+    const sf_count_t chunk_frames = 75 * 588;   // 75 CDDA sectors * 588 audio frames per sector
+    frame_t *frames = malloc(chunk_frames * sizeof(frame_t));
 
-    uint32_t sum_to = nframes;
-    if (track == total_tracks) {
-        sum_to -= skip_frames;
+    if (frames == NULL) {
+        return 0;
     }
 
-    uint32_t v1, v2;
-    uint32_t csum_hi = 0;
-    uint32_t csum_lo = 0;
-    uint32_t multiplier = 1;
-    for (size_t i = 0; i < nframes; i++) {
-        if (multiplier >= sum_from && multiplier <= sum_to) {
-            uint64_t product = (uint64_t)frames[i] * (uint64_t)multiplier;
-            csum_hi += (uint32_t)(product >> 32);
-            csum_lo += (uint32_t)(product);
+    for (sf_count_t pos = 0; pos < info.frames; pos += chunk_frames) {
+        sf_count_t count = info.frames - pos < chunk_frames ? info.frames - pos : chunk_frames;
+
+        if (sf_readf_short(file, (short*)frames, count) != count) {
+            free(frames);
+            return 0;
+        }
+
+        // libsndfile swaps byte order of samples to native CPU endianness.
+        // Ensure the samples are kept as little endian in memory, otherwise
+        // calculated checksums may not match AccurateRip database content.
+        // This is a no-op (LE to LE conversion) in most real-life use cases.
+        sample_t *samples = (sample_t*)frames;
+        for (sf_count_t i = 0; i < 2*count; i++) {  // 2 samples per CDDA frame
+            samples[i] = htole16(samples[i]);
         }
-        multiplier++;
+
+        checksums_update(state, frames, pos, count);
     }
 
-    v1 = csum_lo;
-    v2 = csum_lo + csum_hi;
+    free(frames);
+    return 1;
+}
 
-    return (accuraterip_t){.v1 = v1, .v2 = v2};
+// Open an audio file for reading it from start to end. The kernel is told
+// that the file will be read sequentially, so it can read ahead more data.
+// If the file can't be opened this way, let libsndfile open it by path so
+// that it reports the error.
+static SNDFILE *open_sequential(const char *path, SF_INFO *info)
+{
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) {
+        return sf_open(path, SFM_READ, info);
+    }
+
+#ifdef POSIX_FADV_SEQUENTIAL
+    posix_fadvise(fd, 0, 0, POSIX_FADV_SEQUENTIAL);
+#endif
+
+    return sf_open_fd(fd, SFM_READ, info, SF_TRUE);
 }
 
 static PyObject *checksums(PyObject *self, PyObject *args)
@@ -140,7 +192,7 @@ static PyObject *checksums(PyObject *self, PyObject *args)
         return PyErr_Format(PyExc_ValueError, "Invalid track: %u/%u", track, total_tracks);
     }
 
-    if ((file = sf_open(path, SFM_READ, &info)) == NULL) {
+    if ((file = open_sequential(path, &info)) == NULL) {
         PyErr_SetString(PyExc_OSError, sf_strerror(file));
         return NULL;
     }
@@ -157,21 +209,23 @@ static PyObject *checksums(PyObject *self, PyObject *args)
         return NULL;
     }
 
-    size_t size = 0;
-    sample_t *data = load_audio_data(file, info, &size);
+    checksums_t state = checksums_init(info.frames, track, total_tracks);
+    int ok;
+
+    // Decoding and checksum calculation don't touch any Python objects,
+    // so let other threads run in the meantime.
+    Py_BEGIN_ALLOW_THREADS
+    ok = process_audio_data(file, info, &state);
     sf_close(file);
+    Py_END_ALLOW_THREADS
 
-    if (data == NULL) {
+    if (!ok) {
         PyErr_SetString(PyExc_OSError, "Failed to load audio samples.");
         return NULL;
     }
 
-    uint32_t crc = crc32(0L, Z_NULL, 0);
-    crc = crc32(crc, (uint8_t*)data, 2*size);   // 2 bytes per CDDA sample
-    accuraterip_t ar = accuraterip(data, size, track, total_tracks);
-    free(data);
-
-    return Py_BuildValue("III", ar.v1, ar.v2, crc);
+    accuraterip_t ar = checksums_final(&state);
+    return Py_BuildValue("III", ar.v1, ar.v2, (uint32_t)state.crc);
 }
 
 static PyObject *nframes(PyObject *self, PyObject *args)
@@ -0,0 +1,95 @@
+"""On-disk cache of data obtained from online services."""
+
+import hashlib
+import os
+import tempfile
+import time
+from typing import Optional
+
+NO_CACHE_VARIABLE = 'ARVER_NO_CACHE'
+
+
+def cache_enabled() -> bool:
+    """
+    Return False if the cache was disabled by setting ARVER_NO_CACHE. Empty
+    value or 0 leave the cache enabled.
+    """
+    return os.environ.get(NO_CACHE_VARIABLE, '') in ('', '0')
+
+
+def disable_cache() -> None:
+    """
+    Disable the cache for the rest of this process. This is done by setting
+    ARVER_NO_CACHE, so it applies to any child processes as well.
+    """
+    os.environ[NO_CACHE_VARIABLE] = '1'
+
+
+def _cache_root() -> str:
+    """
+    Return path to ARver cache directory, following XDG Base Directory
+    Specification: $XDG_CACHE_HOME/arver, or ~/.cache/arver if the variable
+    is not set or is not an absolute path.
+    """
+    base = os.environ.get('XDG_CACHE_HOME', '')
+    if not os.path.isabs(base):
+        base = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'arver')
+
+
+class Cache:
+    """
+    A simple file-based cache of binary data. Each entry is stored in its own
+    file in a subdirectory of ARver cache directory. Entries older than
+    max_age seconds are considered expired, and are removed when found.
+
+    The cache is an optimization only: any errors reading or writing cache
+    files are silently ignored, and the data is obtained the usual way.
+    """
+
+    def __init__(self, name: str, max_age: float):
+        self.max_age = max_age
+        self._name = name
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(_cache_root(), self._name, digest)
+
+    def load(self, key: str) -> Optional[bytes]:
+        """Return cached data stored under key, or None if there is none."""
+        if not cache_enabled():
+            return None
+
+        path = self._path(key)
+
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.unlink(path)
+                return None
+            with open(path, 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def store(self, key: str, data: bytes) -> None:
+        """
+        Store data under key. The data is written to a temporary file which
+        is then renamed, so concurrent readers never see partial entries.
+        """
+        if not cache_enabled():
+            return
+
+        path = self._path(key)
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    file.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
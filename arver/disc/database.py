@@ -7,11 +7,14 @@ from typing import ClassVar, List, Optional
 import requests
 
 from arver import APPNAME, URL, VERSION
+from arver.cache import Cache
 
 FETCH_TIMEOUT_SECONDS = 5
 URL_BASE = 'http://www.accuraterip.com/accuraterip/'
 USER_AGENT_STRING = f'{APPNAME}/{VERSION} {URL}'
 
+_ACCURATERIP_CACHE = Cache('accuraterip', max_age=24 * 60 * 60)
+
 
 @dataclass
 class Header:
@@ -26,14 +29,13 @@ class Header:
     freedb_id: int
 
     @classmethod
-    def from_bytes(cls, data):
+    def from_bytes(cls, data, offset=0):
         """
-        Create Header object from the initial bytes of provided binary data. The data
-        is little endian: number of tracks is an unsigned byte, and the three disc IDs
-        are unsigned long integers.
+        Create Header object from the bytes of provided binary data, starting at
+        offset. The data is little endian: number of tracks is an unsigned byte,
+        and the three disc IDs are unsigned long integers.
         """
-        header_bytes = data[:Header.size]
-        unpacked = struct.unpack('<BLLL', header_bytes)
+        unpacked = struct.unpack_from('<BLLL', data, offset)
         return cls(*unpacked)
 
     def __str__(self):
@@ -54,14 +56,13 @@ class Track:
     checksum_450: int
 
     @classmethod
-    def from_bytes(cls, data):
+    def from_bytes(cls, data, offset=0):
         """
-        Create Track object from the initial bytes of provided binary data. The data is
-        little endian: confidence is an unsigned byte, and the two AccurateRip checksums
-        are unsigned long integers.
+        Create Track object from the bytes of provided binary data, starting at offset.
+        The data is little endian: confidence is an unsigned byte, and the two
+        AccurateRip checksums are unsigned long integers.
         """
-        track_bytes = data[:Track.size]
-        unpacked = struct.unpack('<BLL', track_bytes)
+        unpacked = struct.unpack_from('<BLL', data, offset)
         return cls(*unpacked)
 
     def __str__(self):
@@ -95,13 +96,10 @@ class AccurateRipDisc:
     responses: List[Response]
 
     def __str__(self):
-        str_ = ''
+        str_ = []
         for num, response in enumerate(self.responses, start=1):
-            str_ += f'AccurateRip response {num}:\n'
-            str_ += str(response)
-            str_ += '\n\n'
-
-        return str_.strip()
+            str_.append(f'AccurateRip response {num}:\n{response}')
+        return '\n\n'.join(str_)
 
     def __len__(self):
         return len(self.responses)
@@ -203,10 +201,6 @@ class AccurateRipFetcher:
         file_ = f'dBAR-0{self._num_tracks:02d}-{self._ar_id1}-{self._ar_id2}-{self._freedb_id}.bin'
         return URL_BASE + dir_ + file_
 
-    def _shift_bytes(self, num_bytes):
-        """Left shift raw disc data by num_bytes (discard initial bytes)."""
-        self._raw_bytes = self._raw_bytes[num_bytes:]
-
     def _validate_header(self, header):
         """Check if AccurateRip response header matches requested disc."""
         if header.num_tracks != self._num_tracks or \
@@ -243,19 +237,21 @@ class AccurateRipFetcher:
         Response.
 
         Raw disc data is stored in AccurateRipFetcher instance as an array of
-        bytes, and is parsed in the following way:
+        bytes, and is parsed in the following way, starting at offset zero:
 
-        1. Read Header.size bytes from disc data and create a Header object.
+        1. Read Header.size bytes at current offset and create a Header object.
         2. Verify that created Header matches disc data in AccurateRipFetcher instance
            (raise ValueError if it doesn't).
-        3. Shift disc data left by Header.size bytes (discard parsed header bytes).
+        3. Advance the offset by Header.size bytes.
         4. Read the number of tracks from Header. For each track:
-            - read Track.size bytes from disc data and create a Track object,
-            - shift disc data left by Track.size bytes (discard parsed track bytes).
+            - read Track.size bytes at current offset and create a Track object,
+            - advance the offset by Track.size bytes.
         5. Create a Response object from the Header and the list of Tracks.
-        6. If the size of remaining disc data is greater than zero, repeat steps 1-5.
+        6. If the offset hasn't reached the end of disc data, repeat steps 1-5.
         7. Return AccurateRipDisc object created from the list of Responses.
 
+        The raw data is never copied or modified, so each byte is read once.
+
         Two exceptions can be raised: ValueError when Header data doesn't match
         the disc info in AccurateRipFetcher instance, and a struct.error when the
         binary disc data cannot be unpacked. Both indicate that disc data acquired
@@ -263,16 +259,18 @@ class AccurateRipFetcher:
         (they cannot be trusted, even if some of them were successfully parsed).
         """
         responses = []
+        data = self._raw_bytes
+        offset = 0
 
-        while len(self._raw_bytes) > 0:
-            header = Header.from_bytes(self._raw_bytes)
+        while offset < len(data):
+            header = Header.from_bytes(data, offset)
             self._validate_header(header)
-            self._shift_bytes(Header.size)
+            offset += Header.size
 
             tracks = []
             for _ in range(header.num_tracks):
-                tracks.append(Track.from_bytes(self._raw_bytes))
-                self._shift_bytes(Track.size)
+                tracks.append(Track.from_bytes(data, offset))
+                offset += Track.size
 
             responses.append(Response(header, tracks))
 
@@ -282,14 +280,30 @@ class AccurateRipFetcher:
         """
         Fetch binary disc data from AccurateRip database. Return an AccurateRipDisc
         object, or None on error.
+
+        Successfully parsed disc data is cached on disk for a day. AccurateRip
+        data changes as checksums are submitted, but not often enough to justify
+        downloading it again each time the same disc is verified.
         """
+        url = self._make_url()
+
+        cached = _ACCURATERIP_CACHE.load(url)
+        if cached is not None:
+            self._raw_bytes = cached
+            try:
+                return self._parse_raw_bytes()
+            except (struct.error, ValueError):
+                pass  # corrupted cache entry, download the data again
+
         try:
-            response = requests.get(self._make_url(),
+            response = requests.get(url,
                                     headers={'User-Agent': USER_AGENT_STRING},
                                     timeout=FETCH_TIMEOUT_SECONDS)
             response.raise_for_status()
             self._raw_bytes = response.content
-            return self._parse_raw_bytes()
+            disc = self._parse_raw_bytes()
+            _ACCURATERIP_CACHE.store(url, response.content)
+            return disc
         except (requests.ConnectionError, requests.Timeout):
             print('Failed to connect to AccurateRip database. Try again later.')
         except requests.HTTPError as error:
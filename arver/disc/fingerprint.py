@@ -60,12 +60,15 @@ def accuraterip_ids(audio_offsets: List[int], leadout: int) -> Tuple[str, str]:
     lsn_offsets = [offset - LEAD_IN_FRAMES for offset in audio_offsets]
     lsn_leadout = leadout - LEAD_IN_FRAMES
 
-    id1 = 0
-    id2 = 0
+    # Track offsets are strictly increasing, so only the first track can start
+    # at LSN 0. AccurateRip counts it as 1 in the second disc ID, so handle it
+    # once here instead of checking every track in the loop.
+    id1 = lsn_offsets[0]
+    id2 = max(lsn_offsets[0], 1)
 
-    for track_num, offset in enumerate(lsn_offsets, start=1):
+    for track_num, offset in enumerate(lsn_offsets[1:], start=2):
         id1 += offset
-        id2 += (offset or 1) * track_num
+        id2 += offset * track_num
 
     id1 += lsn_leadout
     id2 += lsn_leadout * (len(lsn_offsets) + 1)
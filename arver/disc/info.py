@@ -1,15 +1,21 @@
 """Disc info module for ARver."""
 
-from dataclasses import dataclass, field
+import json
+import sys
+from dataclasses import dataclass, field, replace
 from enum import Enum
+from functools import lru_cache
+from itertools import accumulate, chain, islice
+from types import ModuleType
 from typing import List, Optional
+from urllib.error import HTTPError
 
 import cdio
 import discid
-import musicbrainzngs
 import pycdio
 
 from arver import APPNAME, URL, VERSION
+from arver.cache import Cache
 from arver.disc.database import AccurateRipDisc, AccurateRipFetcher
 from arver.disc.fingerprint import accuraterip_ids, freedb_id, musicbrainz_id
 from arver.disc.utils import LEAD_IN_FRAMES, frames_to_msf
@@ -17,10 +23,16 @@ from arver.disc.utils import LEAD_IN_FRAMES, frames_to_msf
 PREGAP_TRACK_NUM = -1
 ENHANCED_CD_DATA_TRACK_GAP = 11400
 
+_TRACKLIST_HEADER = 'track     length     frames\n-----    --------    ------'
 
-@dataclass
+_MUSICBRAINZ_CACHE = Cache('musicbrainz', max_age=30 * 24 * 60 * 60)
+_MUSICBRAINZ_UNKNOWN_CACHE = Cache('musicbrainz-unknown', max_age=24 * 60 * 60)
+
+
+@dataclass(frozen=True)
 class _Track:
     """Representation of a CD track."""
+    __slots__ = ('num', 'lba', 'frames', 'type')
     num: int
     lba: int
     frames: int
@@ -38,7 +50,7 @@ class _Track:
         elif self.type != 'audio':
             numstr = f'{"DATA":>5s}'
 
-        return f'{numstr}    {self.msf():>8s}    {self.frames:6d}\n'
+        return f'{numstr}    {self.msf():>8s}    {self.frames:6d}'
 
 
 class DiscType(Enum):
@@ -73,11 +85,22 @@ class DiscType(Enum):
     TRACKS = 5
 
 
-def _have_disc(drive: Optional[str] = None) -> bool:
+_DISC_TYPE_NAMES = {
+    DiscType.UNSUPPORTED: 'Unsupported CD type',
+    DiscType.AUDIO: 'Audio CD',
+    DiscType.MIXED_MODE: 'Mixed Mode CD',
+    DiscType.ENHANCED: 'Enhanced CD',
+    DiscType.DISC_ID: 'None (disc ID lookup)',
+    DiscType.TRACKS: 'None (TOC derived from track lengths)'
+}
+
+
+def _read_disc(drive: Optional[str] = None) -> Optional[discid.Disc]:
     """
     Detect if there is a readable disc in the drive. If drive argument is not
     specified, the default drive will be used. The drive is specified using a
-    device path (e.g. /dev/sr0 or similar).
+    device path (e.g. /dev/sr0 or similar). Return the discid object of the
+    disc, or None if the disc couldn't be read.
 
     Using discid here is a good first line of defense: it raises an exception
     when attempting to read CDs with no audio tracks. This means it will fail
@@ -85,12 +108,12 @@ def _have_disc(drive: Optional[str] = None) -> bool:
     discid API is easier to use, and on errors pycdio prints its own messages
     that can't be silenced.
     """
+    # Only the TOC is needed here. Reading ISRCs and MCN is much slower, so
+    # make sure none of the optional features are requested.
     try:
-        discid.read(drive)
+        return discid.read(drive, features=[])
     except discid.DiscError:
-        return False
-
-    return True
+        return None
 
 
 def _is_multisession(device: cdio.Device) -> bool:
@@ -98,12 +121,6 @@ def _is_multisession(device: cdio.Device) -> bool:
     return device.get_last_session() > 0
 
 
-def _is_audio_only(track_list: List[_Track]) -> bool:
-    """Check if track list only contains audio tracks."""
-    types = {track.type for track in track_list}
-    return len(types) == 1 and 'audio' in types
-
-
 def _get_disc_type(device: cdio.Device, track_list: List[_Track]) -> DiscType:
     """
     Determine disc type based on the following rules:
@@ -114,12 +131,14 @@ def _get_disc_type(device: cdio.Device, track_list: List[_Track]) -> DiscType:
     Multisession and the last track is a data track -> Enhanced CD
     Anything else -> unsupported disc (no idea what that could be)
     """
-    if 'audio' not in [track.type for track in track_list]:
+    types = {track.type for track in track_list}
+
+    if 'audio' not in types:
         return DiscType.UNSUPPORTED
 
     multisession = _is_multisession(device)
 
-    if not multisession and _is_audio_only(track_list):
+    if not multisession and types == {'audio'}:
         return DiscType.AUDIO
 
     if not multisession and track_list[0].type == 'data':
@@ -131,14 +150,58 @@ def _get_disc_type(device: cdio.Device, track_list: List[_Track]) -> DiscType:
     return DiscType.UNSUPPORTED
 
 
+@lru_cache(maxsize=None)
+def _musicbrainz() -> ModuleType:
+    """
+    Import musicbrainzngs and set the user agent string. This is done once,
+    on first use: importing musicbrainzngs is relatively slow, and it's not
+    needed at all unless disc ID lookup is requested and not cached.
+    """
+    import musicbrainzngs  # pylint: disable=import-outside-toplevel
+    musicbrainzngs.set_useragent(APPNAME, VERSION, URL)
+    return musicbrainzngs
+
+
+def _lookup_disc_id(disc_id: str) -> Optional[dict]:
+    """
+    Look up disc ID in MusicBrainz and return the response, or None if the
+    disc ID is unknown or invalid. Responses are cached on disk: disc TOCs
+    in MusicBrainz don't change, so repeated lookups are served locally.
+    Disc IDs not found in MusicBrainz are cached for a shorter time, as they
+    may be added later. Other errors are not cached.
+    """
+    cached = _MUSICBRAINZ_CACHE.load(disc_id)
+    if cached is not None:
+        try:
+            return json.loads(cached)
+        except ValueError:
+            pass
+
+    if _MUSICBRAINZ_UNKNOWN_CACHE.load(disc_id) is not None:
+        return None
+
+    musicbrainzngs = _musicbrainz()
+
+    try:
+        response = musicbrainzngs.get_releases_by_discid(disc_id)
+    except musicbrainzngs.ResponseError as exc:
+        if isinstance(exc.cause, HTTPError) and exc.cause.code == 404:
+            _MUSICBRAINZ_UNKNOWN_CACHE.store(disc_id, b'')
+        return None
+
+    _MUSICBRAINZ_CACHE.store(disc_id, json.dumps(response).encode('utf-8'))
+    return response
+
+
 def _calculate_track_lengths(offset_list: List[int], sectors: int) -> List[int]:
     """
     Return a list of track lengths expressed in CD frames.
     Implementation assumes arguments are obtained by MusicBrainz DiscID query.
     Names of arguments follow respective dictionary keys in MB response.
     """
-    shifted = offset_list[1:] + [sectors]
-    return [shf - off for shf, off in zip(shifted, offset_list)]
+    # Each track ends where the next one begins; the last one ends at lead out.
+    ends = chain(islice(offset_list, 1, None), [sectors])
+    return [end - off for end, off in zip(ends, offset_list)]
 
 
 def _get_pregap_track(track_list: List[_Track]) -> Optional[_Track]:
@@ -159,22 +222,13 @@ def _get_pregap_track(track_list: List[_Track]) -> Optional[_Track]:
     return pregap
 
 
-def _fix_last_audio_track(track_list: List[_Track]) -> None:
+def _without_data_track_gap(track: _Track) -> _Track:
     """
-    Fix length of the last audio track by subtracting the length of gap
-    between last audio track and the data track in an enhanced CD. This
-    is needed because pycdio includes this gap in sectors count of the
-    last audio track.
-
-    Obviously this only makes sense when there is a data track following
-    audio tracks, that is in Enhanced CDs.
+    Return a copy of the last audio track of an Enhanced CD, with the gap
+    between it and the data track subtracted from its length. This is needed
+    because pycdio includes this gap in sectors count of the last audio track.
     """
-    for track in reversed(track_list):
-        if track.type != 'audio':
-            continue
-
-        track.frames -= ENHANCED_CD_DATA_TRACK_GAP
-        break
+    return replace(track, frames=track.frames - ENHANCED_CD_DATA_TRACK_GAP)
 
 
 @dataclass
@@ -182,6 +236,9 @@ class DiscInfo:
     """
     Representation of Compact Disc properties required for calculation
     of AccurateRip disc IDs and for performing checksum verification.
+
+    The TOC is not expected to change after the object is created, so disc
+    IDs are computed once, on first use.
     """
     pregap: Optional[_Track]
     track_list: List[_Track]
@@ -189,26 +246,27 @@ class DiscInfo:
     type: DiscType
     accuraterip_data: Optional[AccurateRipDisc] = field(default=None, init=False)
 
+    def __post_init__(self) -> None:
+        self._musicbrainz_id: Optional[str] = None
+        self._accuraterip_id: Optional[str] = None
+
     def _format_tracklist(self):
-        str_ = ''
-        str_ += 'track     length     frames\n'
-        str_ += '-----    --------    ------\n'
+        str_ = [_TRACKLIST_HEADER]
 
         if self.pregap is not None:
-            str_ += str(self.pregap)
-
-        for track in self.track_list:
-            str_ += str(track)
+            str_.append(str(self.pregap))
 
-        return str_.strip()
+        str_.extend(str(track) for track in self.track_list)
+        return '\n'.join(str_)
 
     def __str__(self):
-        str_ = ''
-        str_ += f'AccurateRip disc ID: {self.accuraterip_id()}\n'
-        str_ += f'MusicBrainz disc ID: {self.musicbrainz_id()}\n'
-        str_ += f'Disc type: {self.disc_type()}\n'
-        str_ += '\n' + self._format_tracklist()
-        return str_
+        str_ = []
+        str_.append(f'AccurateRip disc ID: {self.accuraterip_id()}')
+        str_.append(f'MusicBrainz disc ID: {self.musicbrainz_id()}')
+        str_.append(f'Disc type: {self.disc_type()}')
+        str_.append('')
+        str_.append(self._format_tracklist())
+        return '\n'.join(str_)
 
     @classmethod
     def from_cd(cls, drive: Optional[str] = None) -> 'Optional[DiscInfo]':
@@ -220,7 +278,12 @@ class DiscInfo:
         This is the only way to obtain all necessary information to verify
         each supported CD type (i.e. Audio, Mixed Mode and Enhanced).
         """
-        if not _have_disc(drive):
+        # Resolve the default drive once, so that the disc ID and the TOC are
+        # guaranteed to be read from the same device.
+        drive = drive or discid.get_default_device()
+
+        disc = _read_disc(drive)
+        if disc is None:
             return None
 
         device = cdio.Device(source=drive, driver_id=pycdio.DRIVER_DEVICE)
@@ -228,35 +291,38 @@ class DiscInfo:
         num_tracks = device.get_num_tracks()
         lead_out = device.get_track(pycdio.CDROM_LEADOUT_TRACK).get_lba()
 
-        track_list = []
+        track_list: List[_Track] = []
+        last_audio_idx = -1
 
         for num in range(first_track_num, num_tracks + 1):
             track = device.get_track(num)
-            lba = track.get_lba()
 
             if num < 99:
-                frames = track.get_last_lsn() - track.get_lsn() + 1
+                track_last_lsn = track.get_last_lsn()
             else:
                 # track.get_last_lsn() throws an exception for track 99. This looks
                 # like a bug in libcdio. Track 99 must be the last track on the CD,
                 # so we can use the lead out LBA that we already know to calculate
                 # the last LSN of track 99.
                 track_last_lsn = lead_out - LEAD_IN_FRAMES - 1
-                frames = track_last_lsn - track.get_lsn() + 1
 
-            fmt = track.get_format()
-            track_list.append(_Track(num, lba, frames, fmt))
-
-        pregap = _get_pregap_track(track_list)
+            fmt = sys.intern(track.get_format())
+            if fmt == 'audio':
+                last_audio_idx = len(track_list)
+            track_list.append(
+                _Track(num, track.get_lba(), track_last_lsn - track.get_lsn() + 1, fmt))
 
         disc_type = _get_disc_type(device, track_list)
         if disc_type == DiscType.UNSUPPORTED:
             return None
 
         if disc_type == DiscType.ENHANCED:
-            _fix_last_audio_track(track_list)
+            track_list[last_audio_idx] = _without_data_track_gap(track_list[last_audio_idx])
 
-        return cls(pregap, track_list, lead_out, disc_type)
+        # libdiscid has already calculated MusicBrainz disc ID of this CD.
+        disc_info = cls(_get_pregap_track(track_list), track_list, lead_out, disc_type)
+        disc_info._musicbrainz_id = disc.id
+        return disc_info
 
     @classmethod
     def from_disc_id(cls, disc_id: str) -> 'Optional[DiscInfo]':
@@ -270,11 +336,8 @@ class DiscInfo:
         be successful, or resulting confidence values may be lower than what
         would be obtained using a physical CD.
         """
-        musicbrainzngs.set_useragent(APPNAME, VERSION, URL)
-
-        try:
-            response = musicbrainzngs.get_releases_by_discid(disc_id)
-        except musicbrainzngs.ResponseError:
+        response = _lookup_disc_id(disc_id)
+        if response is None:
             return None
 
         lead_out = int(response['disc']['sectors'])
@@ -311,9 +374,7 @@ class DiscInfo:
             pregap_track = _Track(PREGAP_TRACK_NUM, LEAD_IN_FRAMES, pregap, 'audio')
 
         initial_offset = LEAD_IN_FRAMES + pregap
-        lba_offsets = [initial_offset]
-        for length in tracks[:-1]:
-            lba_offsets.append(length + lba_offsets[-1])
+        lba_offsets = list(accumulate(chain([initial_offset], tracks[:-1])))
 
         lead_out = lba_offsets[-1] + tracks[-1]
 
@@ -342,18 +403,13 @@ class DiscInfo:
 
     def disc_type(self) -> str:
         """Return a string describing disc type."""
-        types = {
-            DiscType.UNSUPPORTED: 'Unsupported CD type',
-            DiscType.AUDIO: 'Audio CD',
-            DiscType.MIXED_MODE: 'Mixed Mode CD',
-            DiscType.ENHANCED: 'Enhanced CD',
-            DiscType.DISC_ID: 'None (disc ID lookup)',
-            DiscType.TRACKS: 'None (TOC derived from track lengths)'
-        }
-        return types[self.type]
+        return _DISC_TYPE_NAMES[self.type]
 
     def musicbrainz_id(self) -> str:
         """Return MusicBrainz disc ID as string."""
+        if self._musicbrainz_id is not None:
+            return self._musicbrainz_id
+
         last_audio_track = self.audio_tracks()[-1]
         sectors = last_audio_track.lba + last_audio_track.frames
 
@@ -366,14 +422,19 @@ class DiscInfo:
         else:
             offsets = self._audio_offsets()
 
-        return musicbrainz_id(offsets, sectors)
+        self._musicbrainz_id = musicbrainz_id(offsets, sectors)
+        return self._musicbrainz_id
 
     def accuraterip_id(self) -> str:
         """Return AccurateRip disc ID as string."""
+        if self._accuraterip_id is not None:
+            return self._accuraterip_id
+
         num = len(self.audio_tracks())
         freedb = freedb_id(self._all_offsets(), self.lead_out)
         ar1, ar2 = accuraterip_ids(self._audio_offsets(), self.lead_out)
-        return f'{num:03d}-{ar1:8s}-{ar2:8s}-{freedb:8s}'
+        self._accuraterip_id = f'{num:03d}-{ar1:8s}-{ar2:8s}-{freedb:8s}'
+        return self._accuraterip_id
 
     def fetch_accuraterip_data(self) -> None:
         """
@@ -1,10 +1,14 @@
 """Representation of a set of ripped CDDA files."""
 
-from dataclasses import dataclass
+import os
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
 from fnmatch import fnmatch
 from os.path import basename
-from typing import ClassVar, List, Optional
+from typing import ClassVar, List, Optional, Tuple
 
 from arver.audio.checksums import get_checksums
 from arver.audio.properties import get_nframes
@@ -13,6 +17,22 @@ from arver.disc.utils import frames_to_msf
 
 AUDIO_FRAMES_PER_CD_SECTOR = 588
 NAME_WIDTH = 30
+HTOA_FILE_NAME = re.compile(r'^track00(?:\.cdda)?\.(?:wav|flac)$', re.IGNORECASE)
+
+_RIP_TABLE_HEADER = '\n'.join([
+    f'{"file name":^{NAME_WIDTH}s}    '
+    f'{"CDDA":^4s}    {"length":^8s}    {"frames":^6s}    '
+    f'{"CRC32":^8s}    {"ARv1":^8s}    {"ARv2":^8s}'.rstrip(),
+    f'{NAME_WIDTH*"-"}    {4*"-"}    {8*"-"}    {6*"-"}    '
+    f'{8*"-"}    {8*"-"}    {8*"-"}',
+])
+
+_VERIFICATION_TABLE_HEADER = '\n'.join([
+    f'{"file name":^{NAME_WIDTH}s}    {"result":>6s}    '
+    f'{"checksum":8s}    {"type":4s}    '
+    f'{"conf":4s}    {"resp":4s}'.rstrip(),
+    f'{NAME_WIDTH*"-"}    {6*"-"}    {8*"-"}    {4*"-"}    {4*"-"}    {4*"-"}',
+])
 
 
 class AudioFormatError(Exception):
@@ -32,16 +52,22 @@ def _shorten_path(path: str, max_length: int = NAME_WIDTH) -> str:
 
 class AudioFile:
     """Audio file to be verified against AccurateRip checksum."""
+    __slots__ = ('path', '_short_name', 'cdda_frames', '_is_cd_rip', '_arv1', '_arv2', '_crc32')
 
     def __init__(self, path: str) -> None:
         self.path: str = path
+        self._short_name = _shorten_path(path)
 
         try:
-            self._audio_frames = get_nframes(path)
-            self.cdda_frames = self._audio_frames // AUDIO_FRAMES_PER_CD_SECTOR
+            audio_frames = get_nframes(path)
         except (OSError, TypeError) as exc:
             raise AudioFormatError from exc
 
+        # If an audio file was ripped from a CD, its number of frames is
+        # evenly divisible by the number of audio frames per CD sector.
+        self.cdda_frames, remainder = divmod(audio_frames, AUDIO_FRAMES_PER_CD_SECTOR)
+        self._is_cd_rip = remainder == 0
+
         self._arv1: Optional[int] = None
         self._arv2: Optional[int] = None
         self._crc32: Optional[int] = None
@@ -53,28 +79,30 @@ class AudioFile:
         If file checksums were not calculated prior to method call, they are
         printed as "unknown".
         """
-        short_name = _shorten_path(self.path)
-        is_cdda = 'yes' if self._is_cd_rip() else 'no'
+        short_name = self._short_name
+        is_cdda = 'yes' if self._is_cd_rip else 'no'
         length_msf = frames_to_msf(self.cdda_frames)
 
         arv1 = f'{self._arv1:08x}' if self._arv1 is not None else 'unknown'
         arv2 = f'{self._arv2:08x}' if self._arv2 is not None else 'unknown'
         crc32 = f'{self._crc32:08x}' if self._crc32 is not None else 'unknown'
 
-        return f'{short_name:<{NAME_WIDTH}s}    {is_cdda:>4s}    ' + \
-               f'{length_msf:>8s}    {self.cdda_frames:>6d}    ' + \
+        return f'{short_name:<{NAME_WIDTH}s}    {is_cdda:>4s}    ' \
+               f'{length_msf:>8s}    {self.cdda_frames:>6d}    ' \
                f'{crc32:>8s}    {arv1:>8s}    {arv2:>8s}'
 
-    def _is_cd_rip(self) -> bool:
+    def set_checksums(self, checksums: Tuple[int, int, int]) -> None:
+        """Set AccurateRip and CRC32 checksums, as returned by get_checksums()."""
+        self._arv1, self._arv2, self._crc32 = checksums
+
+    def checksums(self) -> Tuple[int, int, int]:
         """
-        If an audio file was ripped from a CD, its number of frames is
-        evenly divisible by the number of audio frames per CD sector.
+        Return AccurateRip and CRC32 checksums as a triple (v1, v2, crc32).
+        ValueError is raised if checksums have not been set.
         """
-        return self._audio_frames % AUDIO_FRAMES_PER_CD_SECTOR == 0
-
-    def set_checksums(self, track_no: int, total_tracks: int) -> None:
-        """Calculate and set AccurateRip and CRC32 checksums."""
-        self._arv1, self._arv2, self._crc32 = get_checksums(self.path, track_no, total_tracks)
+        if self._arv1 is None or self._arv2 is None or self._crc32 is None:
+            raise ValueError('Checksums have not been calculated!')
+        return self._arv1, self._arv2, self._crc32
 
 
 class _Status(Enum):
@@ -84,6 +112,9 @@ class _Status(Enum):
     NODATA = 2
 
 
+_STATUS_STRINGS = {_Status.SUCCESS: 'OK', _Status.FAILED: 'FAILED', _Status.NODATA: 'N/A'}
+
+
 @dataclass
 class TrackVerificationResult:
     """Results of AccurateRip verification of a single track."""
@@ -93,14 +124,17 @@ class TrackVerificationResult:
     confidence: int
     response: int
     status: _Status
+    _short_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._short_name = _shorten_path(self.path)
 
     def _status_string(self) -> str:
-        results = {_Status.SUCCESS: 'OK', _Status.FAILED: 'FAILED', _Status.NODATA: 'N/A'}
-        return results[self.status]
+        return _STATUS_STRINGS[self.status]
 
     def as_table_row(self) -> str:
         """Return string formatted as a row suitable for verification summary table."""
-        short_name = _shorten_path(self.path)
+        short_name = self._short_name
         status = self._status_string()
         confidence = str(self.confidence) if self.confidence != -1 else '--'
         response = str(self.response) if self.response != -1 else '--'
@@ -126,17 +160,15 @@ class DiscVerificationResult:
 
     def as_table(self) -> str:
         """Format verification results as a table."""
-        header = f'{"file name":^{NAME_WIDTH}s}    {"result":>6s}    ' \
-            f'{"checksum":8s}    {"type":4s}    ' \
-            f'{"conf":4s}    {"resp":4s}'.rstrip()
-        underline = f'{NAME_WIDTH*"-"}    {6*"-"}    {8*"-"}    {4*"-"}    {4*"-"}    {4*"-"}'
-        table = [header, underline] + [track.as_table_row() for track in self.tracks]
+        table = [_VERIFICATION_TABLE_HEADER]
+        table.extend(track.as_table_row() for track in self.tracks)
         return '\n'.join(table)
 
     def summary(self) -> str:
         """Return a string with the description of verification result."""
-        num_failed = len([track for track in self.tracks if track.status == _Status.FAILED])
-        num_nodata = len([track for track in self.tracks if track.status == _Status.NODATA])
+        statuses = Counter(track.status for track in self.tracks)
+        num_failed = statuses[_Status.FAILED]
+        num_nodata = statuses[_Status.NODATA]
 
         no_checksum = ''
         if num_nodata != 0:
@@ -155,8 +187,31 @@ class DiscVerificationResult:
         return no_checksum + self.some_failed
 
 
+def _verify_track(path: str, ar1: int, ar2: int,
+                  track_checksums: dict) -> Tuple[TrackVerificationResult, str]:
+    """
+    Match AccurateRip checksums of a file against the checksums of its CD track.
+    Return the verification result and a line of verification report.
+    """
+    if len(track_checksums) == 0:
+        result = TrackVerificationResult(path, ar2, 'ARv2', -1, -1, _Status.NODATA)
+        return result, '\tAccurateRip: no checksums available for this track'
+
+    for checksum, version in ((ar2, 'ARv2'), (ar1, 'ARv1')):
+        match = track_checksums.get(checksum)
+        if match is not None:
+            conf, resp = match['confidence'], match['response']
+            result = TrackVerificationResult(path, checksum, version, conf, resp, _Status.SUCCESS)
+            line = f'\tAccurateRip: {checksum:08x} ({version}), confidence {conf}, response {resp}'
+            return result, line
+
+    result = TrackVerificationResult(path, ar2, 'ARv2', -1, -1, _Status.FAILED)
+    return result, f'\tAccurateRip: {ar2:08x} (ARv2) - no match!'
+
+
 class Rip:
     """This class represents a set of ripped audio files to be verified."""
+    __slots__ = ('_paths', '_have_checksums', 'tracks')
 
     def __init__(self, paths: List[str], exclude: Optional[List[str]] = None) -> None:
         self._paths: List[str] = paths
@@ -175,17 +230,18 @@ class Rip:
         """
         Discard paths matching HTOA patterns.
 
-        If exclude argument is None, a list of common naming patterns is used.
-        The default list is ignored when any exclude patterns are specified.
+        If exclude argument is None, common HTOA file names are discarded
+        (track00.wav, track00.cdda.wav, track00.flac or track00.cdda.flac,
+        case insensitive). They are not discarded by default when any exclude
+        patterns are specified.
         """
-        htoa_patterns = ['track00.wav', 'track00.cdda.wav', 'track00.flac', 'track00.cdda.flac']
-
-        if exclude is not None:
-            htoa_patterns = []
-            for pattern in exclude:
-                htoa_patterns += [basename(path) for path in self._paths if fnmatch(path, pattern)]
+        if exclude is None:
+            self._paths = [path for path in self._paths if not HTOA_FILE_NAME.match(basename(path))]
+            return
 
-        self._paths = [path for path in self._paths if basename(path) not in htoa_patterns]
+        self._paths = [
+            path for path in self._paths if not any(fnmatch(path, pattern) for pattern in exclude)
+        ]
 
     def as_table(self) -> str:
         """
@@ -194,16 +250,10 @@ class Rip:
         The first call of this method calculates all checksums, so there will
         be a delay before it returns. Subsequent calls will return instantly.
         """
-        self._calculate_checksums()
+        self.calculate_checksums()
 
-        header = f'{"file name":^{NAME_WIDTH}s}    ' + \
-            f'{"CDDA":^4s}    {"length":^8s}    {"frames":^6s}    ' + \
-            f'{"CRC32":^8s}    {"ARv1":^8s}    {"ARv2":^8s}'.rstrip()
-
-        underline = f'{NAME_WIDTH*"-"}    {4*"-"}    {8*"-"}    {6*"-"}    ' + \
-                    f'{8*"-"}    {8*"-"}    {8*"-"}'
-
-        table = [header, underline] + [track.as_table_row() for track in self.tracks]
+        table = [_RIP_TABLE_HEADER]
+        table.extend(track.as_table_row() for track in self.tracks)
         return '\n'.join(table)
 
     def __len__(self) -> int:
@@ -213,7 +263,7 @@ class Rip:
         """Return the lengths of all tracks in CDDA frames as a list of integers."""
         return [track.cdda_frames for track in self.tracks]
 
-    def _calculate_checksums(self) -> None:
+    def calculate_checksums(self) -> None:
         """
         Iterate file list and calculate copy CRCs and AccurateRip checksums.
         It only makes no sense to calculate checksums once for a given rip, so
@@ -226,11 +276,60 @@ class Rip:
         if self._have_checksums is True:
             return
 
-        for num, track in enumerate(self.tracks, start=1):
-            track.set_checksums(num, len(self))
+        total = len(self)
+        paths = [track.path for track in self.tracks]
+        track_nums = range(1, total + 1)
+
+        # Checksum calculation is CPU-bound and each file is independent. The
+        # C extension releases the GIL while it works, so use a thread per CPU
+        # core. A single file or a single core isn't worth the overhead.
+        workers = min(total, os.cpu_count() or 1)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(get_checksums, path, num, total)
+                    for path, num in zip(paths, track_nums)
+                ]
+                try:
+                    checksums = [future.result() for future in futures]
+                except BaseException:
+                    # Don't wait for the remaining files on error or Ctrl-C.
+                    for future in futures:
+                        future.cancel()
+                    raise
+        else:
+            checksums = [get_checksums(path, num, total) for path, num in zip(paths, track_nums)]
+
+        for track, track_checksums in zip(self.tracks, checksums):
+            track.set_checksums(track_checksums)
 
         self._have_checksums = True
 
+    def _track_count_matches(self, disc: DiscInfo) -> bool:
+        """Return True if there is a file for each audio track on CD."""
+        return len(self) == len(disc.audio_tracks())
+
+    def _length_mismatches(self, disc: DiscInfo) -> List[Tuple[int, int, str]]:
+        """
+        Return a list of (CD track number, length difference, file path) triples
+        for files whose length in CDDA frames differs from the CD track. The
+        difference is positive if the CD track is longer.
+        """
+        return [(cd_track.num, cd_track.frames - audio_file.cdda_frames, audio_file.path)
+                for audio_file, cd_track in zip(self.tracks, disc.audio_tracks())
+                if cd_track.frames != audio_file.cdda_frames]
+
+    def matches_disc(self, disc: DiscInfo, permissive: bool) -> bool:
+        """
+        Return True if the rip passes the checks done before verification
+        against the disc (see _sanity_check). Nothing is printed, so this can
+        be used to decide whether calculating checksums is worth it.
+        """
+        if not self._track_count_matches(disc):
+            return False
+
+        return permissive or not self._length_mismatches(disc)
+
     def _sanity_check(self, disc: DiscInfo, permissive: bool) -> None:
         """
         Make sure that the disc and rip are matching: the rip must have the
@@ -241,30 +340,25 @@ class Rip:
         Mismatch in the number of tracks is always fatal. Differences in track
         lengths can be ignored by enabling permissive mode.
         """
-        num_files = len(self)
-        num_tracks = len(disc.audio_tracks())
-
-        if num_files != num_tracks:
+        if not self._track_count_matches(disc):
+            num_files = len(self)
+            num_tracks = len(disc.audio_tracks())
             print(f'Track number mismatch: {num_files} to verify, but {num_tracks} on disc.')
             if num_files == num_tracks + 1 and disc.pregap is not None:
                 print('Make sure the pregap track is not included.')
             raise ValueError
 
-        num_mismatched = 0
-        for audio_file, cd_track in zip(self.tracks, disc.audio_tracks()):
-            delta = cd_track.frames - audio_file.cdda_frames
-            if delta != 0:
-                num_mismatched += 1
-                diff = abs(delta)
-                frames = 'frames' if diff > 1 else 'frame'
-                relation = 'shorter' if delta < 0 else 'longer'
-                filename = basename(audio_file.path)
-                print(f'CD track {cd_track.num} is {diff} {frames} {relation} than "{filename}"')
-
-        if num_mismatched != 0:
+        mismatches = self._length_mismatches(disc)
+        for num, delta, path in mismatches:
+            diff = abs(delta)
+            frames = 'frames' if diff > 1 else 'frame'
+            relation = 'shorter' if delta < 0 else 'longer'
+            print(f'CD track {num} is {diff} {frames} {relation} than "{basename(path)}"')
+
+        if mismatches:
             print()
 
-        if not permissive and num_mismatched != 0:
+        if not permissive and mismatches:
             print('Track length mismatch. Retry in permissive mode to verify anyway.')
             raise ValueError
 
@@ -282,43 +376,23 @@ class Rip:
         if disc_info.accuraterip_data is None:
             raise ValueError('Cannot verify: missing AccurateRip data!')
 
+        # Checksums are calculated by rip index, which is the same as enumerating
+        # the tracks of the rip from one, so they can be shared with rip info.
+        self.calculate_checksums()
+
         checksums = disc_info.accuraterip_data.make_dict()
         results: List[TrackVerificationResult] = []
+        report: List[str] = []
 
         mixed_mode = disc_info.type == DiscType.MIXED_MODE
         toc_idx_start = 1 if not mixed_mode else 2
 
         for toc_idx, track in enumerate(self.tracks, start=toc_idx_start):
-            rip_idx = toc_idx if not mixed_mode else toc_idx - 1
-            ar1, ar2, crc32 = get_checksums(track.path, rip_idx, len(self))
-
-            print(f'Track {toc_idx}:')
-            print(f'\tPath: {track.path}')
-            print(f'\tCopy CRC: {crc32:08x}')
-
-            if len(checksums[toc_idx]) == 0:
-                results.append(
-                    TrackVerificationResult(track.path, ar2, 'ARv2', -1, -1, _Status.NODATA))
-                print('\tAccurateRip: no checksums available for this track')
-                continue
-
-            if ar2 in checksums[toc_idx]:
-                conf = checksums[toc_idx][ar2]['confidence']
-                resp = checksums[toc_idx][ar2]['response']
-                print(f'\tAccurateRip: {ar2:08x} (ARv2), confidence {conf}, response {resp}')
-                results.append(
-                    TrackVerificationResult(track.path, ar2, 'ARv2', conf, resp, _Status.SUCCESS))
-                continue
-
-            if ar1 in checksums[toc_idx]:
-                conf = checksums[toc_idx][ar1]['confidence']
-                resp = checksums[toc_idx][ar1]['response']
-                print(f'\tAccurateRip: {ar1:08x} (ARv1), confidence {conf}, response {resp}')
-                results.append(
-                    TrackVerificationResult(track.path, ar1, 'ARv1', conf, resp, _Status.SUCCESS))
-                continue
-
-            print(f'\tAccurateRip: {ar2:08x} (ARv2) - no match!')
-            results.append(TrackVerificationResult(track.path, ar2, 'ARv2', -1, -1, _Status.FAILED))
+            ar1, ar2, crc32 = track.checksums()
+            result, line = _verify_track(track.path, ar1, ar2, checksums[toc_idx])
+            results.append(result)
+            report.append(f'Track {toc_idx}:\n\tPath: {track.path}\n\tCopy CRC: {crc32:08x}')
+            report.append(line)
 
+        print('\n'.join(report))
         return DiscVerificationResult(results)
@@ -39,7 +39,7 @@ setup(name=APPNAME,
           Extension('arver.audio._audio',
                     sources=['arver/audio/_audio.c'],
                     libraries=['sndfile', 'z'],
-                    extra_compile_args=['-std=c99', '-D_DEFAULT_SOURCE'],
+                    extra_compile_args=['-std=c99', '-O3', '-D_DEFAULT_SOURCE'],
                     define_macros=[('Py_LIMITED_API', '0x03070000')],
                     py_limited_api=True)
       ],
@@ -0,0 +1,55 @@
+"""Tests of on-disk cache."""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+from temp_cache import TempCacheTestCase
+
+from arver.cache import Cache
+
+
+class TestCache(TempCacheTestCase):
+    """Test storing and loading cache entries."""
+
+    def test_store_load(self):
+        cache = Cache('test', max_age=60)
+        cache.store('key', b'data')
+        self.assertEqual(cache.load('key'), b'data')
+
+    def test_missing(self):
+        cache = Cache('test', max_age=60)
+        self.assertIsNone(cache.load('key'))
+
+    def test_empty_entry(self):
+        cache = Cache('test', max_age=60)
+        cache.store('key', b'')
+        self.assertEqual(cache.load('key'), b'')
+
+    def test_expired(self):
+        cache = Cache('test', max_age=60)
+        cache.store('key', b'data')
+        with patch('time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.load('key'))
+        self.assertEqual(os.listdir(os.path.join(self.tmp_dir.name, 'arver', 'test')), [])
+
+    def test_disabled(self):
+        cache = Cache('test', max_age=60)
+        cache.store('key', b'data')
+        with patch.dict(os.environ, {'ARVER_NO_CACHE': '1'}):
+            self.assertIsNone(cache.load('key'))
+            cache.store('other', b'data')
+        self.assertIsNone(cache.load('other'))
+
+    def test_not_disabled_by_zero(self):
+        cache = Cache('test', max_age=60)
+        with patch.dict(os.environ, {'ARVER_NO_CACHE': '0'}):
+            cache.store('key', b'data')
+            self.assertEqual(cache.load('key'), b'data')
+
+
+if __name__ == '__main__':
+    unittest.main()
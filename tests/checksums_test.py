@@ -3,7 +3,12 @@
 # pylint: disable=missing-function-docstring
 
 import os
+import random
+import struct
+import tempfile
 import unittest
+import wave
+import zlib
 
 from arver.audio.checksums import get_checksums
 
@@ -70,6 +75,57 @@ class TestAccurateRip(unittest.TestCase):
             self.assertTupleEqual(accuraterip, self.silence)
 
 
+class TestLongTrack(unittest.TestCase):
+    """
+    Test checksums of tracks longer than one chunk of audio data read by the
+    C extension (75 CDDA sectors), with length that isn't a multiple of the
+    chunk size. Expected values are calculated by a plain Python version of
+    the algorithms.
+    """
+
+    nframes = 110250  # 2.5 seconds: two full chunks and one partial chunk
+    skip_frames = 5 * 588
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        cls.path = os.path.join(cls.tmp_dir.name, 'long.wav')
+        random_bits = random.Random(0).getrandbits(32 * cls.nframes)
+        cls.data = random_bits.to_bytes(4 * cls.nframes, 'little')
+
+        with wave.open(cls.path, 'wb') as wav:
+            # pylint: disable=no-member  # wave.open() is inferred to return Wave_read
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(44100)
+            wav.writeframes(cls.data)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def _expected(self, track_no, total_tracks):
+        frames = struct.unpack(f'<{self.nframes}L', self.data)
+        sum_from = self.skip_frames if track_no == 1 else 1
+        sum_to = self.nframes - self.skip_frames if track_no == total_tracks else self.nframes
+
+        csum_hi = csum_lo = 0
+        for mult in range(sum_from, sum_to + 1):
+            product = frames[mult - 1] * mult
+            csum_hi += product >> 32
+            csum_lo += product & 0xffffffff
+
+        csum_hi &= 0xffffffff
+        csum_lo &= 0xffffffff
+        return csum_lo, (csum_lo + csum_hi) & 0xffffffff, zlib.crc32(self.data)
+
+    def test_positions(self):
+        for track, total in [(1, 1), (1, 3), (2, 3), (3, 3)]:
+            with self.subTest(track=track, total=total):
+                result = get_checksums(self.path, track, total)
+                self.assertTupleEqual(result, self._expected(track, total))
+
+
 class TestCrc32(unittest.TestCase):
     """
     Test calculation of CRC32 checksum.
@@ -3,11 +3,17 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=protected-access
 
+import io
 import json
 import os
 import struct
 import unittest
+from contextlib import redirect_stdout
+from unittest.mock import MagicMock, patch
 
+from temp_cache import TempCacheTestCase
+
+from arver.cache import Cache
 from arver.disc.database import AccurateRipDisc, AccurateRipFetcher
 
 CWD = os.path.abspath(os.path.dirname(__file__))
@@ -67,7 +73,7 @@ class TestBinaryParser(unittest.TestCase):
         with open(f'{RESPONSES_DIR}/truncated_response.bin', 'rb') as response:
             fetcher._raw_bytes = response.read()
 
-        with self.assertRaisesRegex(struct.error, 'unpack requires a buffer'):
+        with self.assertRaisesRegex(struct.error, 'requires a buffer'):
             fetcher._parse_raw_bytes()
 
     def test_single_track_response(self):
@@ -101,3 +107,47 @@ class TestBinaryParser(unittest.TestCase):
         expected = _load_json_disc_data(disc_id)
 
         self.assertEqual(actual, expected)
+
+
+class TestFetchCache(TempCacheTestCase):
+    """Test caching of AccurateRip data downloaded by AccurateRipFetcher."""
+
+    disc_id = '013-00206791-01486a82-a710de0d'
+
+    def setUp(self):
+        super().setUp()
+
+        self.fetcher = AccurateRipFetcher.from_id(self.disc_id)
+        self.cache = Cache('accuraterip', max_age=60)
+        with open(f'{RESPONSES_DIR}/dBAR-{self.disc_id}.bin', 'rb') as response:
+            self.content = response.read()
+
+    @patch('arver.disc.database.requests.get')
+    def test_cached_entry(self, mock_get):
+        mock_get.return_value = MagicMock(content=self.content)
+
+        for _ in range(2):
+            disc = self.fetcher.fetch()
+            self.assertEqual(disc.make_dict(), _load_json_disc_data(self.disc_id))  # type: ignore
+
+        mock_get.assert_called_once()
+
+    @patch('arver.disc.database.requests.get')
+    def test_corrupt_entry(self, mock_get):
+        with open(f'{RESPONSES_DIR}/truncated_response.bin', 'rb') as response:
+            self.cache.store(self.fetcher._make_url(), response.read())
+        mock_get.return_value = MagicMock(content=self.content)
+
+        disc = self.fetcher.fetch()
+        self.assertEqual(disc.make_dict(), _load_json_disc_data(self.disc_id))  # type: ignore
+        mock_get.assert_called_once()
+        self.assertEqual(self.cache.load(self.fetcher._make_url()), self.content)
+
+    @patch('arver.disc.database.requests.get')
+    def test_invalid_response_not_cached(self, mock_get):
+        with open(f'{RESPONSES_DIR}/wrong_header.bin', 'rb') as response:
+            mock_get.return_value = MagicMock(content=response.read())
+
+        with redirect_stdout(io.StringIO()):
+            self.assertIsNone(self.fetcher.fetch())
+        self.assertIsNone(self.cache.load(self.fetcher._make_url()))
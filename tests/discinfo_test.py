@@ -4,7 +4,13 @@ import json
 import os
 import unittest
 from unittest.mock import patch
+from urllib.error import HTTPError
 
+from temp_cache import TempCacheTestCase
+
+import musicbrainzngs
+
+from arver.cache import Cache
 from arver.disc.info import DiscInfo
 
 CWD = os.path.abspath(os.path.dirname(__file__))
@@ -13,6 +19,7 @@ CWD = os.path.abspath(os.path.dirname(__file__))
 class TestDiscInfo(unittest.TestCase):
     """Tests of DiscInfo class."""
 
+    @patch.dict(os.environ, {'ARVER_NO_CACHE': '1'})
     @patch('musicbrainzngs.get_releases_by_discid')
     def test_discid_recalculation(self, mock_get):
         """
@@ -102,5 +109,65 @@ class TestDiscInfo(unittest.TestCase):
             self.assertEqual(disc_info.accuraterip_id(), disc['accuraterip_id'])
 
 
+class TestMusicBrainzCache(TempCacheTestCase):
+    """Tests of caching MusicBrainz responses."""
+
+    disc_id = 'X_fUy2PVsk5KK7JciFqBc0CetiI-'
+
+    def setUp(self):
+        super().setUp()
+
+        with open(f'{CWD}/data/discs/{self.disc_id}.json', encoding='utf-8') as disc:
+            self.response = json.load(disc)
+
+    @staticmethod
+    def _response_error(code):
+        cause = HTTPError('https://musicbrainz.org/', code, 'error', None, None)  # type: ignore
+        return musicbrainzngs.ResponseError(cause=cause)
+
+    @patch('musicbrainzngs.get_releases_by_discid')
+    def test_cached_response(self, mock_get):
+        """The second lookup of the same disc ID should be served from cache."""
+        mock_get.return_value = self.response
+
+        for _ in range(2):
+            disc_info = DiscInfo.from_disc_id(self.disc_id)
+            self.assertEqual(self.disc_id, disc_info.musicbrainz_id())  # type: ignore
+
+        mock_get.assert_called_once_with(self.disc_id)
+
+    @patch('musicbrainzngs.get_releases_by_discid')
+    def test_corrupt_entry(self, mock_get):
+        """A corrupt cache entry should be ignored and replaced."""
+        Cache('musicbrainz', max_age=60).store(self.disc_id, b'{"disc":')
+        mock_get.return_value = self.response
+
+        for _ in range(2):
+            disc_info = DiscInfo.from_disc_id(self.disc_id)
+            self.assertEqual(self.disc_id, disc_info.musicbrainz_id())  # type: ignore
+
+        mock_get.assert_called_once_with(self.disc_id)
+
+    @patch('musicbrainzngs.get_releases_by_discid')
+    def test_not_found(self, mock_get):
+        """Disc IDs not found in MusicBrainz should be cached as unknown."""
+        mock_get.side_effect = self._response_error(404)
+
+        for _ in range(2):
+            self.assertIsNone(DiscInfo.from_disc_id(self.disc_id))
+
+        mock_get.assert_called_once_with(self.disc_id)
+
+    @patch('musicbrainzngs.get_releases_by_discid')
+    def test_other_error(self, mock_get):
+        """Other errors should not be cached."""
+        mock_get.side_effect = self._response_error(503)
+
+        for _ in range(2):
+            self.assertIsNone(DiscInfo.from_disc_id(self.disc_id))
+
+        self.assertEqual(mock_get.call_count, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,56 @@
+"""Tests of checking a rip against disc TOC."""
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+
+from arver.disc.info import DiscInfo
+from arver.rip.rip import Rip
+
+CWD = os.path.abspath(os.path.dirname(__file__))
+SAMPLE_WAV_PATH = CWD + '/data/samples/sample.wav'
+SAMPLE_FLAC_PATH = CWD + '/data/samples/sample.flac'
+
+
+class TestSanityCheck(unittest.TestCase):
+    """
+    Test matching the rip against disc TOC. The quiet check must agree with
+    the one done before verification. Both sample files are 75 frames long.
+    """
+
+    rip = Rip([SAMPLE_WAV_PATH, SAMPLE_FLAC_PATH])
+
+    def _sanity_check_passes(self, disc, permissive):
+        with redirect_stdout(io.StringIO()):
+            try:
+                self.rip._sanity_check(disc, permissive)
+            except ValueError:
+                return False
+        return True
+
+    def _assert_result(self, disc, permissive, expected):
+        self.assertEqual(self.rip.matches_disc(disc, permissive), expected)
+        self.assertEqual(self._sanity_check_passes(disc, permissive), expected)
+
+    def test_matching(self):
+        disc = DiscInfo.from_track_lengths([75, 75], 0, 0)
+        self._assert_result(disc, False, True)
+
+    def test_track_number_mismatch(self):
+        disc = DiscInfo.from_track_lengths([75, 75, 75], 0, 0)
+        self._assert_result(disc, False, False)
+        self._assert_result(disc, True, False)
+
+    def test_track_length_mismatch(self):
+        disc = DiscInfo.from_track_lengths([75, 76], 0, 0)
+        self._assert_result(disc, False, False)
+        self._assert_result(disc, True, True)
+        self.assertEqual(self.rip._length_mismatches(disc), [(2, 1, SAMPLE_FLAC_PATH)])
+
+
+if __name__ == '__main__':
+    unittest.main()
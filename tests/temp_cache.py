@@ -0,0 +1,26 @@
+"""Test fixture for tests of on-disk caching."""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+class TempCacheTestCase(unittest.TestCase):
+    """
+    Base class of test cases using ARver cache. Each test gets an empty cache
+    in a temporary directory, with caching enabled regardless of the
+    environment the tests are run in.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        env = {'XDG_CACHE_HOME': self.tmp_dir.name, 'ARVER_NO_CACHE': ''}
+        self.env_patch = patch.dict(os.environ, env)
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.tmp_dir.cleanup()